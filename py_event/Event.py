@@ -1,6 +1,16 @@
+import heapq
 import weakref
 from _weakref import ReferenceType
-from typing import Any, Dict, List, Tuple
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from py_event.EventFuture import EventFuture
+from py_event.Listener import Listener
+
+_MISSING = object()
+"""
+Sentinel for an attribute that is missing on the event data.
+"""
 
 
 class Event:
@@ -32,9 +42,67 @@ class Event:
         The object that emits this event.
         """
 
-        self.__listeners: Dict[ReferenceType, List[Tuple[callable, Any]]] = {}
+        self.__listeners: Dict[ReferenceType, List[Listener]] = {}
+        """
+        The listeners that will be notified when this events has been triggered.
+        """
+
+        self.__sequence: int = 0
+        """
+        The sequence number of the last registration of a listener.
+        """
+
+        self.__pending: List[Tuple[Sequence[int], List[ReferenceType], List[callable], List[Any]]] = []
+        """
+        The listeners registered in bulk that have not been set up yet, i.e. per bulk registration the sequence numbers,
+        the weak references (with callback) to the objects, the unbound functions, and the listener data of the
+        listeners.
+        """
+
+        self.__pending_callback: Optional[Callable[[ReferenceType], None]] = None
+        """
+        The callback of the weak references of the listeners registered in bulk that have not been set up yet.
+        """
+
+        self.__pending_size: int = 0
+        """
+        The number of listeners registered in bulk that have not been set up yet.
+        """
+
+        self.__pending_dead: int = 0
+        """
+        The number of listeners registered in bulk that have not been set up yet and of which the object has been
+        garbage collected.
+        """
+
+        self.__followers: Dict[Tuple[ReferenceType, callable], List[Listener]] = {}
+        """
+        The listeners with ordering constraints indexed by the methods that must be notified before these listeners.
+        """
+
+        self.__generation: int = 0
+        """
+        The generation of the listeners of this event. Incremented each time the listeners of this event change.
+        """
+
+        self.__plan_generation: int = -1
+        """
+        The generation of the listeners of this event for which the dispatch plan has been build.
+        """
+
+        self.__plan: Tuple[Tuple[Listener, ...], ...] = ()
         """
-        The listeners that will be notified when this events has been triggered.        
+        The dispatch plan of this event, i.e. the stages of listeners in dispatch order.
+        """
+
+        self.__unkeyed: Tuple[Listener, ...] = ()
+        """
+        The listeners without a key based filter in dispatch order.
+        """
+
+        self.__index: Dict[str, Dict[Any, Tuple[Listener, ...]]] = {}
+        """
+        The listeners with a key based filter indexed by attribute name and value and in dispatch order.
         """
 
     # ------------------------------------------------------------------------------------------------------------------
@@ -56,6 +124,64 @@ class Event:
         """
         Event.__event_dispatcher.internal_queue_event(self, event_data)
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def trigger_with_future(self, event_data: Any = None) -> EventFuture:
+        """
+        Triggers this event. That is, the event is put on the event queue of the event dispatcher. Returns the future
+        of this trigger, which is done when all listeners of this event have run. The future can be awaited in an
+        asyncio coroutine while the event queue is being dispatched by another coroutine, e.g. with atrigger().
+
+        :param Any event_data: Additional data supplied by the event emitter.
+        """
+        future = EventFuture()
+        Event.__event_dispatcher.internal_queue_event(self, event_data, future)
+
+        return future
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def trigger_and_wait(self, event_data: Any = None) -> EventFuture:
+        """
+        Triggers this event and dispatches the event queue until all listeners of this event have run. Returns the
+        future of this trigger, which is done.
+
+        This method can not be called while the event dispatcher is dispatching events, e.g. from an event listener.
+
+        :param Any event_data: Additional data supplied by the event emitter.
+        """
+        if Event.__event_dispatcher.is_running:
+            raise RuntimeError('Can not wait for an event while the event dispatcher is dispatching events')
+
+        future = self.trigger_with_future(event_data)
+        Event.__event_dispatcher.internal_run_until(future)
+
+        return future
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def atrigger(self, event_data: Any = None) -> EventFuture:
+        """
+        Triggers this event and dispatches the event queue until all listeners of this event have run. Returns the
+        future of this trigger, which is done.
+
+        The events on the event queue are dispatched one at a time and control is given back to the asyncio event loop
+        after each event. Hence, other coroutines can run while the event queue is being dispatched.
+
+        This method can not be called while the event dispatcher is dispatching events, e.g. from an event listener.
+
+        :param Any event_data: Additional data supplied by the event emitter.
+        """
+        import asyncio
+
+        if Event.__event_dispatcher.is_running:
+            raise RuntimeError('Can not wait for an event while the event dispatcher is dispatching events')
+
+        future = self.trigger_with_future(event_data)
+        Event.__event_dispatcher.internal_dispatch_next()
+        while not future.done():
+            await asyncio.sleep(0)
+            Event.__event_dispatcher.internal_dispatch_next()
+
+        return future
+
     # ------------------------------------------------------------------------------------------------------------------
     def unregister_object(self, instance: Any) -> None:
         """
@@ -63,9 +189,13 @@ class Event:
 
         :param Any instance: An object.
         """
+        if self.__pending:
+            self.__materialize()
+
         listener_ref = weakref.ref(instance)
         if listener_ref in self.__listeners:
-            del self.__listeners[listener_ref]
+            self.__deactivate(self.__listeners.pop(listener_ref))
+            self.__generation += 1
 
     # ------------------------------------------------------------------------------------------------------------------
     def unregister_method(self, method: callable) -> None:
@@ -74,33 +204,125 @@ class Event:
 
         :param Any method: The listener.
         """
+        if self.__pending:
+            self.__materialize()
+
         if hasattr(method, '__self__'):
             listener_ref = weakref.ref(method.__self__)
             if listener_ref in self.__listeners:
                 listeners = self.__listeners[listener_ref]
                 for key in range(len(listeners) - 1, -1, -1):
-                    if listeners[key][0] == method.__func__:
+                    if listeners[key].function == method.__func__:
+                        self.__deactivate([listeners[key]])
                         del listeners[key]
 
                 if not listeners:
                     del self.__listeners[listener_ref]
 
+                self.__generation += 1
+
     # ------------------------------------------------------------------------------------------------------------------
-    def register_listener(self, method: callable, listener_data: Any = None) -> None:
+    def register_listener(self,
+                          method: callable,
+                          listener_data: Any = None,
+                          attribute: Optional[str] = None,
+                          value: Any = None,
+                          predicate: Optional[Callable[[Any], bool]] = None,
+                          priority: int = 0,
+                          after: Optional[Iterable[callable]] = None,
+                          before: Optional[Iterable[callable]] = None) -> None:
         """
         Registers a listener for this event.
 
+        A listener can be restricted to a subset of the triggers of this event with a filter. The filter is evaluated
+        before the listener is invoked. With a key based filter, i.e. attribute and value, the listener is notified only
+        when the attribute of the event data equals value. Listeners with a key based filter are indexed by value,
+        hence listeners that do not match are not visited at all when this event is dispatched. With a predicate the
+        listener is notified only when the predicate returns True for the event data.
+
+        By default, listeners are notified in the order of registration. Listeners with a higher priority are notified
+        before listeners with a lower priority, unless ordering constraints given by after and before require
+        otherwise. The ordering is resolved once into a dispatch plan that is cached until the listeners of this event
+        change.
+
+        Listeners (un)registered while this event is being dispatched do not affect that dispatch, except that
+        unregistered listeners are not notified anymore.
+
         :param callable method: Will be called when this event has been triggered.
         :param Any listener_data: Additional data supplied by the listener destination.
+        :param str|None attribute: If not None, the name of the attribute of the event data that must equal value.
+        :param Any value: The value the attribute of the event data must equal. Must be hashable.
+        :param callable|None predicate: If not None, a callable that will be called with the event data and must return
+                                        True for the listener to be notified.
+        :param int priority: The priority of the listener.
+        :param iterable[callable]|None after: The methods that must be notified before the listener.
+        :param iterable[callable]|None before: The methods that must be notified after the listener.
         """
         if not hasattr(method, '__self__'):
             raise ValueError('Only an object can be a listener')
 
-        listener_ref = weakref.ref(method.__self__, self.internal_unregister_listener)
-        if listener_ref not in self.__listeners:
-            self.__listeners[listener_ref] = []
+        if attribute is not None:
+            hash(value)
+
+        after = Event.__method_keys(after)
+        before = Event.__method_keys(before)
+
+        listener_ref, listeners = self.__listeners_of(method.__self__)
+
+        self.__sequence += 1
+        listener = Listener(listener_ref,
+                            method.__func__,
+                            listener_data,
+                            attribute,
+                            value,
+                            predicate,
+                            priority,
+                            after,
+                            before,
+                            self.__sequence)
+        listeners.append(listener)
+        for key in after:
+            self.__followers.setdefault(key, []).append(listener)
+
+        if (after or before) and self.__is_on_cycle(listener):
+            self.__deactivate([listener])
+            listeners.pop()
+            if not listeners:
+                del self.__listeners[listener_ref]
 
-        self.__listeners[listener_ref].append((method.__func__, listener_data))
+            raise ValueError('The ordering constraints of the listener are cyclic')
+
+        self.__generation += 1
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def register_listeners(self, listeners: Iterable[Tuple[callable, Any]]) -> None:
+        """
+        Registers listeners for this event in bulk. Has the same effect as calling register_listener(method,
+        listener_data) for each method and listener data in listeners. However, the listeners are set up in one pass
+        when this event is dispatched for the first time. Hence, listeners of events that are never triggered cost
+        hardly anything.
+
+        :param iterable[tuple[callable,Any]] listeners: The methods and listener data of the listeners.
+        """
+        listeners = list(listeners)
+        if self.__pending_callback is None:
+            self.__pending_callback = self.__create_pending_callback()
+        callback = self.__pending_callback
+        try:
+            listener_refs = [weakref.ref(method.__self__, callback) for method, _ in listeners]
+        except AttributeError:
+            raise ValueError('Only an object can be a listener') from None
+        functions = [method.__func__ for method, _ in listeners]
+        listener_data = [data for _, data in listeners]
+
+        if listeners:
+            self.__pending.append((range(self.__sequence + 1, self.__sequence + len(listeners) + 1),
+                                   listener_refs,
+                                   functions,
+                                   listener_data))
+            self.__sequence += len(listeners)
+            self.__pending_size += len(listeners)
+            self.__generation += 1
 
     # ------------------------------------------------------------------------------------------------------------------
     def internal_unregister_listener(self, listener_ref: ReferenceType) -> None:
@@ -109,14 +331,293 @@ class Event:
 
         :param ReferenceType listener_ref: The weak references to the listener.
         """
-        del self.__listeners[listener_ref]
+        listeners = self.__listeners.pop(listener_ref, None)
+        if listeners is not None:
+            self.__deactivate(listeners)
+            self.__generation += 1
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def internal_get_listeners(self, event_data: Any) -> Sequence[Listener]:
+        """
+        Returns a snapshot of the listeners of this event in dispatch order, excluding the listeners with a key based
+        filter that does not match the event data. The snapshot is not affected by (un)registering listeners later on.
+
+        :param Any event_data: Additional data supplied by the event emitter.
+        """
+        if self.__plan_generation != self.__generation:
+            self.__build_plan()
+
+        matching = []
+        for attribute, index in self.__index.items():
+            try:
+                matches = index.get(getattr(event_data, attribute, _MISSING))
+            except Exception:
+                # The attribute can not be read or its value is not hashable, hence it can not match any listener.
+                matches = None
+
+            if matches:
+                matching.append(matches)
+
+        if not matching:
+            return self.__unkeyed
+
+        if not self.__unkeyed and len(matching) == 1:
+            return matching[0]
+
+        # All tuples are in dispatch order already, hence merging suffices.
+        return tuple(heapq.merge(self.__unkeyed, *matching, key=attrgetter('position')))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def internal_get_dispatch_plan(self) -> Tuple[Tuple[Listener, ...], ...]:
+        """
+        Returns the dispatch plan of this event, i.e. the listeners of this event grouped in stages. The ordering
+        constraints of a listener refer to listeners in preceding stages only. Hence, the listeners in one stage are
+        independent of each other and can be run concurrently by a parallel dispatcher, provided that the stages are
+        run one after the other.
+        """
+        if self.__plan_generation != self.__generation:
+            self.__build_plan()
+
+        return self.__plan
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __listeners_of(self, instance: Any) -> Tuple[ReferenceType, List[Listener]]:
+        """
+        Returns the weak reference to an object and the listeners of the object of this event. The weak reference is
+        created only if the object has no listeners yet.
+
+        :param Any instance: The object.
+        """
+        listeners = self.__listeners.get(weakref.ref(instance))
+        if listeners:
+            return listeners[0].listener_ref, listeners
+
+        listener_ref = weakref.ref(instance, self.internal_unregister_listener)
+        listeners = []
+        self.__listeners[listener_ref] = listeners
+
+        return listener_ref, listeners
 
     # ------------------------------------------------------------------------------------------------------------------
-    def internal_get_listeners(self) -> Dict[ReferenceType, List[Tuple[callable, Any]]]:
+    def __materialize(self) -> None:
         """
-        Returns all listeners of this event.
+        Sets up the listeners registered in bulk in one pass. The listeners are grouped by object under the first weak
+        reference to the object, i.e. no new weak references are created.
         """
-        return self.__listeners
+        pending = self.__pending
+        self.__pending = []
+
+        # Keep the objects alive until all weak references have been hashed and the callback has been switched.
+        objects = []
+        groups = self.__listeners
+        for sequences, listener_refs, functions, listener_data in pending:
+            for sequence, listener_ref, function, data in zip(sequences, listener_refs, functions, listener_data):
+                listener_object = listener_ref()
+                if listener_object is not None:
+                    objects.append(listener_object)
+                    listeners = groups.get(listener_ref)
+                    if listeners is None:
+                        groups[listener_ref] = [Listener(listener_ref, function, data, None, None, None, 0, (), (),
+                                                         sequence)]
+                    else:
+                        listeners.append(Listener(listeners[0].listener_ref, function, data, None, None, None, 0, (),
+                                                  (), sequence))
+
+        self.__pending_callback = None
+        self.__pending_size = 0
+        self.__pending_dead = 0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __compact(self) -> None:
+        """
+        Removes the listeners registered in bulk of which the object has been garbage collected from the listeners that
+        have not been set up yet.
+        """
+        pending = []
+        size = 0
+        for sequences, listener_refs, functions, listener_data in self.__pending:
+            alive = [key for key, listener_ref in enumerate(listener_refs) if listener_ref() is not None]
+            if alive:
+                pending.append(([sequences[key] for key in alive],
+                                [listener_refs[key] for key in alive],
+                                [functions[key] for key in alive],
+                                [listener_data[key] for key in alive]))
+                size += len(alive)
+
+        self.__pending = pending
+        self.__pending_size = size
+        self.__pending_dead = 0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __create_pending_callback(self) -> Callable[[ReferenceType], None]:
+        """
+        Returns a new callback for the weak references of listeners registered in bulk. As long as the listeners have
+        not been set up, the callback counts the garbage collected objects and compacts the listeners when more than
+        half of the objects have been garbage collected. Once the listeners have been set up, the callback unregisters
+        the listeners of the garbage collected object.
+        """
+        def callback(listener_ref: ReferenceType) -> None:
+            if self.__pending_callback is callback:
+                self.__pending_dead += 1
+                if 2 * self.__pending_dead > self.__pending_size:
+                    self.__compact()
+            else:
+                self.internal_unregister_listener(listener_ref)
+
+        return callback
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __build_plan(self) -> None:
+        """
+        Builds the dispatch plan of this event and indexes the listeners of this event on their key based filters.
+
+        The listeners are sorted topologically on their ordering constraints, and otherwise on priority and
+        registration. If the ordering constraints are cyclic, the listeners that can not be sorted are dispatched after
+        all other listeners.
+        """
+        if self.__pending:
+            self.__materialize()
+
+        listeners = [listener for listeners in self.__listeners.values() for listener in listeners]
+
+        if not any(listener.after or listener.before for listener in listeners):
+            # Without ordering constraints the dispatch plan consists of a single stage, sorted on priority and
+            # registration.
+            listeners.sort(key=attrgetter('sequence'))
+            listeners.sort(key=attrgetter('priority'), reverse=True)
+            for position, listener in enumerate(listeners):
+                listener.position = position
+                listener.stage = 0
+            order = listeners
+        else:
+            methods = {}
+            for listener in listeners:
+                methods.setdefault((listener.listener_ref, listener.function), []).append(listener)
+
+            successors = {listener: [] for listener in listeners}
+            predecessors = dict.fromkeys(listeners, 0)
+            for listener in listeners:
+                for key in listener.after:
+                    for other in methods.get(key, ()):
+                        successors[other].append(listener)
+                        predecessors[listener] += 1
+                for key in listener.before:
+                    for other in methods.get(key, ()):
+                        successors[listener].append(other)
+                        predecessors[other] += 1
+
+            heap = [(-listener.priority, listener.sequence, listener) for listener in listeners if
+                    not predecessors[listener]]
+            heapq.heapify(heap)
+
+            for listener in listeners:
+                listener.stage = 0
+
+            order = []
+            while heap:
+                listener = heapq.heappop(heap)[2]
+                listener.position = len(order)
+                order.append(listener)
+                for successor in successors[listener]:
+                    successor.stage = max(successor.stage, listener.stage + 1)
+                    predecessors[successor] -= 1
+                    if not predecessors[successor]:
+                        heapq.heappush(heap, (-successor.priority, successor.sequence, successor))
+
+            if len(order) < len(listeners):
+                stage = max((other.stage for other in order), default=-1)
+                for other in sorted((other for other in listeners if predecessors[other]),
+                                    key=lambda other: (-other.priority, other.sequence)):
+                    stage += 1
+                    other.stage = stage
+                    other.position = len(order)
+                    order.append(other)
+
+        stages = []
+        unkeyed = []
+        index = {}
+        for listener in order:
+            while listener.stage >= len(stages):
+                stages.append([])
+            stages[listener.stage].append(listener)
+
+            if listener.attribute is None:
+                unkeyed.append(listener)
+            else:
+                index.setdefault(listener.attribute, {}).setdefault(listener.value, []).append(listener)
+
+        self.__plan = tuple(tuple(stage) for stage in stages)
+        self.__plan_generation = self.__generation
+        self.__unkeyed = tuple(unkeyed)
+        self.__index = {attribute: {value: tuple(matches) for value, matches in values.items()}
+                        for attribute, values in index.items()}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __is_on_cycle(self, candidate: Listener) -> bool:
+        """
+        Returns True if and only if a listener is on a cycle of the ordering constraints of the listeners of this event.
+        Only the listeners that must be notified after the listener are visited.
+
+        :param Listener candidate: The listener.
+        """
+        if self.__pending:
+            self.__materialize()
+
+        seen = set()
+        stack = [candidate]
+        while stack:
+            listener = stack.pop()
+            successors = list(self.__followers.get((listener.listener_ref, listener.function), ()))
+            for listener_ref, function in listener.before:
+                successors.extend(other for other in self.__listeners.get(listener_ref, ()) if
+                                  other.function == function)
+
+            for successor in successors:
+                if successor is candidate:
+                    return True
+                if successor not in seen:
+                    seen.add(successor)
+                    stack.append(successor)
+
+        return False
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __deactivate(self, listeners: Iterable[Listener]) -> None:
+        """
+        Marks listeners as unregistered and removes the listeners from the index of ordering constraints.
+
+        :param iterable[Listener] listeners: The listeners.
+        """
+        for listener in listeners:
+            listener.active = False
+            for key in listener.after:
+                followers = self.__followers[key]
+                followers.remove(listener)
+                if not followers:
+                    del self.__followers[key]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __method_keys(methods: Optional[Iterable[callable]]) -> Tuple[Tuple[ReferenceType, callable], ...]:
+        """
+        Returns the keys, i.e. the weak reference to the object and the unbound function, of methods.
+
+        :param iterable[callable]|None methods: The methods.
+        """
+        if not methods:
+            return ()
+
+        keys = []
+        for method in methods:
+            if not hasattr(method, '__self__'):
+                raise ValueError('Only a method of an object can be an ordering constraint')
+            keys.append((weakref.ref(method.__self__), method.__func__))
+
+        # Compute the hashes of the weak references while the objects are alive.
+        keys = tuple(keys)
+        hash(keys)
+
+        return keys
 
     # ------------------------------------------------------------------------------------------------------------------
     @staticmethod
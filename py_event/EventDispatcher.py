@@ -1,7 +1,9 @@
 import traceback
-from typing import Any, List, Tuple
+from collections import deque
+from typing import Any, Deque, Iterable, Optional, Tuple
 
 from py_event.Event import Event
+from py_event.EventFuture import EventFuture
 
 
 class EventDispatcher:
@@ -10,6 +12,10 @@ class EventDispatcher:
     other event is processed. Hence, an event listener will run entirely before any other code runs (which can
     potentially modify the data the event listener invokes).
 
+    Events 'event_queue_high' and 'event_queue_low' are not put on the event queue. They are dispatched immediately
+    when the size of the event queue crosses a watermark, or, when an event listener triggers an event, right after the
+    event being dispatched has been processed completely.
+
     Methods with name starting with 'internal_' MUST not be called from your application (only friend classes are
     allowed to call these methods).
     """
@@ -42,11 +48,44 @@ class EventDispatcher:
         Event that will be triggered when the event queue is empty.
         """
 
-        self.__queue: List[Tuple[Event, Any]] = []
+        self.__event_queue_high = Event(self)
+        """
+        Event that will be triggered when the size of the event queue reaches the high watermark.
+        """
+
+        self.__event_queue_low = Event(self)
+        """
+        Event that will be triggered when the size of the event queue drops to the low watermark after the high
+        watermark has been reached.
+        """
+
+        self.__queue: Deque[Tuple[Event, Any, Optional[EventFuture]]] = deque()
         """
         The queue with events that have been triggered but have not been dispatched yet.
         """
 
+        self.__is_high: bool = False
+        """
+        True if and only if the size of the event queue has reached the high watermark and has not dropped to the low
+        watermark since.
+        """
+
+        self.__is_high_pending: bool = False
+        """
+        True if and only if the size of the event queue has reached the high watermark while an event was being
+        dispatched and event 'event_queue_high' has not been dispatched yet.
+        """
+
+        self.__high_watermark: Optional[int] = None
+        """
+        If not None, the size of the event queue at which event 'event_queue_high' will be triggered.
+        """
+
+        self.__low_watermark: int = 0
+        """
+        The size of the event queue at which event 'event_queue_low' will be triggered.
+        """
+
         self.__is_running: bool = False
         """
         True if and only if this dispatcher is dispatching events.
@@ -102,6 +141,105 @@ class EventDispatcher:
         """
         return self.__event_queue_empty
 
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def event_queue_high(self) -> Event:
+        """
+        Returns the event that will be triggered when the size of the event queue reaches the high watermark.
+
+        This event is not put on the event queue but is dispatched immediately with the size of the event queue as
+        event data, or, when the event queue is filled by an event listener, right after the event being dispatched has
+        been processed completely. Hence, emitters can throttle themselves before the event queue overruns memory.
+        """
+        return self.__event_queue_high
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def event_queue_low(self) -> Event:
+        """
+        Returns the event that will be triggered when the size of the event queue drops to the low watermark after the
+        high watermark has been reached.
+
+        This event is not put on the event queue but is dispatched immediately with the size of the event queue as
+        event data.
+        """
+        return self.__event_queue_low
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def high_watermark(self) -> Optional[int]:
+        """
+        Returns the size of the event queue at which event 'event_queue_high' will be triggered. None if event
+        'event_queue_high' is never triggered.
+        """
+        return self.__high_watermark
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @high_watermark.setter
+    def high_watermark(self, high_watermark: Optional[int]) -> None:
+        """
+        Sets the size of the event queue at which event 'event_queue_high' will be triggered.
+
+        :param int|None high_watermark: The high watermark. Must be greater than the low watermark. If None, event
+                                        'event_queue_high' is never triggered.
+        """
+        if high_watermark is not None and high_watermark <= self.__low_watermark:
+            raise ValueError('The high watermark must be greater than the low watermark')
+
+        self.__high_watermark = high_watermark
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def low_watermark(self) -> int:
+        """
+        Returns the size of the event queue at which event 'event_queue_low' will be triggered after event
+        'event_queue_high' has been triggered.
+        """
+        return self.__low_watermark
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @low_watermark.setter
+    def low_watermark(self, low_watermark: int) -> None:
+        """
+        Sets the size of the event queue at which event 'event_queue_low' will be triggered after event
+        'event_queue_high' has been triggered.
+
+        :param int low_watermark: The low watermark. Must be less than the high watermark.
+        """
+        if self.__high_watermark is not None and low_watermark >= self.__high_watermark:
+            raise ValueError('The low watermark must be less than the high watermark')
+
+        self.__low_watermark = low_watermark
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def is_running(self) -> bool:
+        """
+        Returns True if and only if this dispatcher is dispatching events.
+        """
+        return self.__is_running
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def register_listeners(table: Iterable[Tuple[Event, callable, Any]]) -> None:
+        """
+        Registers listeners for events in bulk. Has the same effect as calling event.register_listener(method,
+        listener_data) for each event, method, and listener data in the table. However, the listeners of an event are
+        set up in one pass when the event is dispatched for the first time.
+
+        :param iterable[tuple[Event,callable,Any]] table: The events, methods, and listener data of the listeners.
+        """
+        listeners = {}
+        for event, method, listener_data in table:
+            rows = listeners.get(event)
+            if rows is None:
+                rows = []
+                listeners[event] = rows
+            rows.append((method, listener_data))
+
+        for event, rows in listeners.items():
+            event.register_listeners(rows)
+
     # ------------------------------------------------------------------------------------------------------------------
     def queue_size(self) -> int:
         """
@@ -130,9 +268,7 @@ class EventDispatcher:
                 self.__dispatch_event(self.__event_queue_empty, None)
 
             while self.__queue:
-                event, event_data = self.__queue.pop(0)
-
-                self.__dispatch_event(event, event_data)
+                self.__dispatch_queued_event()
 
                 if not self.__queue and not self.exit:
                     self.__dispatch_event(self.__event_queue_empty, None)
@@ -145,6 +281,22 @@ class EventDispatcher:
 
         return not self.__is_running
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def __dispatch_queued_event(self) -> None:
+        """
+        Dispatches the first event on the event queue.
+        """
+        event, event_data, future = self.__queue.popleft()
+
+        if self.__is_high and len(self.__queue) <= self.__low_watermark:
+            self.__is_high = False
+            self.__dispatch_event(self.__event_queue_low, len(self.__queue))
+
+        self.__dispatch_event(event, event_data)
+
+        if future:
+            future.internal_set_done()
+
     # ------------------------------------------------------------------------------------------------------------------
     def __dispatch_event(self, event: Event, event_data: Any) -> None:
         """
@@ -153,18 +305,22 @@ class EventDispatcher:
         :param Event event: The event to be dispatch.
         :param Any event_data: Additional data supplied by the event emitter.
         """
-        listeners = event.internal_get_listeners()
-        for listener_ref in listeners:
-            listener_object = listener_ref()
-            if listener_object:
-                for function, listener_data in listeners[listener_ref]:
+        for listener in event.internal_get_listeners(event_data):
+            if listener.active:
+                listener_object = listener.listener_ref()
+                if listener_object:
                     try:
-                        function(listener_object, event, event_data, listener_data)
+                        if listener.predicate is None or listener.predicate(event_data):
+                            listener.function(listener_object, event, event_data, listener.listener_data)
                     except Exception:
                         traceback.print_exc()
 
+        if self.__is_high_pending:
+            self.__is_high_pending = False
+            self.__dispatch_event(self.__event_queue_high, len(self.__queue))
+
     # ------------------------------------------------------------------------------------------------------------------
-    def internal_queue_event(self, event: Event, event_data: Any) -> None:
+    def internal_queue_event(self, event: Event, event_data: Any, future: Optional[EventFuture] = None) -> None:
         """
         Puts an event that has been triggered on the event queue.
 
@@ -172,7 +328,55 @@ class EventDispatcher:
 
         :param Event event: The event that has been triggered.
         :param Any event_data: Additional data supplied by the event emitter.
+        :param EventFuture|None future: If not None, the future that must be marked as done when all listeners of the
+                                        event have run.
+        """
+        self.__queue.append((event, event_data, future))
+
+        if not self.__is_high and self.__high_watermark is not None and len(self.__queue) >= self.__high_watermark:
+            self.__is_high = True
+            if self.__is_running:
+                # Do not interrupt the event listener that triggered the event.
+                self.__is_high_pending = True
+            else:
+                self.__dispatch_event(self.__event_queue_high, len(self.__queue))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def internal_run_until(self, future: EventFuture) -> None:
+        """
+        Dispatches events on the event queue until a future is done. Events 'event_loop_start', 'event_queue_empty', and
+        'event_loop_end' are not triggered.
+
+        Note: Do not use this method directly. Use py_event.Event.Event.trigger_and_wait() instead.
+
+        :param EventFuture future: The future.
         """
-        self.__queue.append((event, event_data))
+        if self.__is_running:
+            raise RuntimeError('The event dispatcher is dispatching events already')
+
+        self.__is_running = True
+        try:
+            while self.__queue and not future.done():
+                self.__dispatch_queued_event()
+        finally:
+            self.__is_running = False
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def internal_dispatch_next(self) -> None:
+        """
+        Dispatches the first event on the event queue. Events 'event_loop_start', 'event_queue_empty', and
+        'event_loop_end' are not triggered.
+
+        Note: Do not use this method directly. Use py_event.Event.Event.atrigger() instead.
+        """
+        if self.__is_running:
+            raise RuntimeError('The event dispatcher is dispatching events already')
+
+        self.__is_running = True
+        try:
+            if self.__queue:
+                self.__dispatch_queued_event()
+        finally:
+            self.__is_running = False
 
 # ----------------------------------------------------------------------------------------------------------------------
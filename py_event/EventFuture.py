@@ -0,0 +1,88 @@
+import traceback
+from typing import Callable, List
+
+
+class EventFuture:
+    """
+    A lightweight future that is done when all listeners of a triggered event have run.
+
+    Like the event dispatcher, this future is not thread safe and must be used from the thread that dispatches the
+    events.
+
+    Methods with name starting with 'internal_' MUST not be called from your application (only friend classes are
+    allowed to call these methods).
+    """
+    __slots__ = ('__done', '__callbacks')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self):
+        """
+        Object constructor.
+        """
+        self.__done: bool = False
+        """
+        True if and only if all listeners of the event have run.
+        """
+
+        self.__callbacks: List[Callable[['EventFuture'], None]] = []
+        """
+        The callbacks that will be called when this future is done.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __await__(self):
+        """
+        Waits until this future is done.
+        """
+        if not self.__done:
+            import asyncio
+
+            future = asyncio.get_running_loop().create_future()
+
+            def resolve(_) -> None:
+                if not future.done():
+                    future.set_result(None)
+
+            self.add_done_callback(resolve)
+
+            yield from future.__await__()
+
+        return self
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def done(self) -> bool:
+        """
+        Returns True if and only if all listeners of the event have run.
+        """
+        return self.__done
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def add_done_callback(self, callback: Callable[['EventFuture'], None]) -> None:
+        """
+        Adds a callback that will be called with this future when this future is done. If this future is done already
+        the callback is called immediately.
+
+        :param callable callback: The callback.
+        """
+        if self.__done:
+            callback(self)
+        else:
+            self.__callbacks.append(callback)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def internal_set_done(self) -> None:
+        """
+        Marks this future as done and calls the callbacks. Exceptions raised by the callbacks are printed and do not
+        prevent other callbacks from being called.
+        """
+        self.__done = True
+
+        callbacks = self.__callbacks
+        self.__callbacks = []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                traceback.print_exc()
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,111 @@
+from _weakref import ReferenceType
+from typing import Any, Callable, Optional, Tuple
+
+
+class Listener:
+    """
+    Class for listeners registered for an event.
+
+    Objects of this class are created by py_event.Event.Event only and MUST not be modified by your application.
+    """
+    __slots__ = ('listener_ref', 'function', 'listener_data', 'attribute', 'value', 'predicate', 'priority', 'after',
+                 'before', 'sequence', 'position', 'stage', 'active')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self,
+                 listener_ref: ReferenceType,
+                 function: callable,
+                 listener_data: Any,
+                 attribute: Optional[str],
+                 value: Any,
+                 predicate: Optional[Callable[[Any], bool]],
+                 priority: int,
+                 after: Tuple[Tuple[ReferenceType, callable], ...],
+                 before: Tuple[Tuple[ReferenceType, callable], ...],
+                 sequence: int):
+        """
+        Object constructor.
+
+        :param ReferenceType listener_ref: The weak reference to the object that listens.
+        :param callable function: The unbound function that will be called when the event has been triggered.
+        :param Any listener_data: Additional data supplied by the listener destination.
+        :param str|None attribute: If not None, the name of the attribute of the event data that must equal value.
+        :param Any value: The value the attribute of the event data must equal.
+        :param callable|None predicate: If not None, a callable that must return True for the event data.
+        :param int priority: The priority of this listener.
+        :param tuple after: The weak references to the objects and the unbound functions of the methods that must be
+                            notified before this listener.
+        :param tuple before: The weak references to the objects and the unbound functions of the methods that must be
+                             notified after this listener.
+        :param int sequence: The sequence number of the registration of this listener.
+        """
+        self.listener_ref: ReferenceType = listener_ref
+        """
+        The weak reference to the object that listens.
+        """
+
+        self.function: callable = function
+        """
+        The unbound function that will be called when the event has been triggered.
+        """
+
+        self.listener_data: Any = listener_data
+        """
+        Additional data supplied by the listener destination.
+        """
+
+        self.attribute: Optional[str] = attribute
+        """
+        If not None, the name of the attribute of the event data that must equal value.
+        """
+
+        self.value: Any = value
+        """
+        The value the attribute of the event data must equal.
+        """
+
+        self.predicate: Optional[Callable[[Any], bool]] = predicate
+        """
+        If not None, a callable that must return True for the event data.
+        """
+
+        self.priority: int = priority
+        """
+        The priority of this listener. Listeners with a higher priority are notified first.
+        """
+
+        self.after: Tuple[Tuple[ReferenceType, callable], ...] = after
+        """
+        The weak references to the objects and the unbound functions of the methods that must be notified before this
+        listener.
+        """
+
+        self.before: Tuple[Tuple[ReferenceType, callable], ...] = before
+        """
+        The weak references to the objects and the unbound functions of the methods that must be notified after this
+        listener.
+        """
+
+        self.sequence: int = sequence
+        """
+        The sequence number of the registration of this listener.
+        """
+
+        self.position: int = 0
+        """
+        The position of this listener in the dispatch plan of the event.
+        """
+
+        self.stage: int = 0
+        """
+        The stage of this listener in the dispatch plan of the event. Listeners in the same stage are independent of
+        each other.
+        """
+
+        self.active: bool = True
+        """
+        True if and only if this listener is registered. Listeners unregistered while the event is being dispatched are
+        not notified anymore.
+        """
+
+# ----------------------------------------------------------------------------------------------------------------------
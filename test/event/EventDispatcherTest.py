@@ -1,5 +1,8 @@
+import asyncio
 import gc
 import unittest
+import weakref
+from contextlib import redirect_stderr
 from io import StringIO
 
 from py_event.Event import Event
@@ -396,4 +399,919 @@ event_loop_end
         # Expect no exception.
         self.assertTrue(True)
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_filter_key(self):
+        """
+        Test listeners with a key based filter are notified only when the event data matches.
+        """
+        out = StringIO()
+
+        dispatcher = EventDispatcher.instance()
+
+        class Data:
+            def __init__(self, kind):
+                self.kind = kind
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, event, event_data, listener_data):
+                out.write(str(event_data.kind) + ' ' + listener_data)
+                out.write('\n')
+
+        # Create object for firing events.
+        spam = Spam()
+
+        # Register event listeners.
+        spam.event.register_listener(spam.handle_event, 'ham', 'kind', 'ham')
+        spam.event.register_listener(spam.handle_event, 'all')
+        spam.event.register_listener(spam.handle_event, 'eggs', 'kind', 'eggs')
+
+        # Trigger some events before the event loop.
+        spam.event.trigger(Data('eggs'))
+        spam.event.trigger(Data('ham'))
+        spam.event.trigger(Data('bacon'))
+        spam.event.trigger(Data(['unhashable']))
+
+        # Start the event loop.
+        dispatcher.loop()
+
+        actual = out.getvalue()
+
+        expected = """
+eggs all
+eggs eggs
+ham ham
+ham all
+bacon all
+['unhashable'] all
+"""
+
+        self.assertEqual(expected.strip(), actual.strip())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_filter_key_error(self):
+        """
+        Test an attribute of the event data that raises an exception does not match any listener.
+        """
+        out = StringIO()
+
+        dispatcher = EventDispatcher.instance()
+
+        class Data:
+            @property
+            def kind(self):
+                raise RuntimeError('No kind')
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, event, event_data, listener_data):
+                out.write(listener_data)
+                out.write('\n')
+
+        # Create object for firing events.
+        spam = Spam()
+
+        # Register event listeners.
+        spam.event.register_listener(spam.handle_event, 'ham', 'kind', 'ham')
+        spam.event.register_listener(spam.handle_event, 'all')
+
+        # Trigger an event before the event loop.
+        spam.event.trigger(Data())
+
+        # Start the event loop.
+        self.assertTrue(dispatcher.loop())
+        self.assertFalse(dispatcher.is_running)
+
+        self.assertEqual('all', out.getvalue().strip())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_filter_key_multiple(self):
+        """
+        Test listeners with key based filters on different attributes and listeners without a key based filter are
+        notified in order of registration.
+        """
+        out = StringIO()
+
+        dispatcher = EventDispatcher.instance()
+
+        class Data:
+            def __init__(self, kind, color):
+                self.kind = kind
+                self.color = color
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, event, event_data, listener_data):
+                out.write(event_data.kind + ' ' + event_data.color + ' ' + listener_data)
+                out.write('\n')
+
+        # Create object for firing events.
+        spam = Spam()
+
+        # Register event listeners.
+        spam.event.register_listener(spam.handle_event, 'color', 'color', 'red')
+        spam.event.register_listener(spam.handle_event, 'all')
+        spam.event.register_listener(spam.handle_event, 'kind', 'kind', 'a')
+
+        # Trigger some events before the event loop.
+        spam.event.trigger(Data('a', 'red'))
+        spam.event.trigger(Data('b', 'red'))
+        spam.event.trigger(Data('b', 'blue'))
+
+        # Start the event loop.
+        self.assertTrue(dispatcher.loop())
+        self.assertFalse(dispatcher.is_running)
+
+        actual = out.getvalue()
+
+        expected = """
+a red color
+a red all
+a red kind
+b red color
+b red all
+b blue all
+"""
+
+        self.assertEqual(expected.strip(), actual.strip())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_filter_predicate(self):
+        """
+        Test listeners with a predicate are notified only when the predicate holds for the event data.
+        """
+        out = StringIO()
+
+        dispatcher = EventDispatcher.instance()
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, event, event_data, listener_data):
+                out.write(str(event_data) + ' ' + listener_data)
+                out.write('\n')
+
+        # Create object for firing events.
+        spam = Spam()
+
+        # Register event listeners.
+        spam.event.register_listener(spam.handle_event, 'even', predicate=lambda event_data: event_data % 2 == 0)
+        spam.event.register_listener(spam.handle_event, 'all')
+
+        # Trigger some events before the event loop.
+        spam.event.trigger(1)
+        spam.event.trigger(2)
+
+        # Start the event loop.
+        dispatcher.loop()
+
+        actual = out.getvalue()
+
+        expected = """
+1 all
+2 even
+2 all
+"""
+
+        self.assertEqual(expected.strip(), actual.strip())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_ordering(self):
+        """
+        Test listeners are notified in order of priority and ordering constraints.
+        """
+        out = StringIO()
+
+        dispatcher = EventDispatcher.instance()
+
+        class Spam:
+            def __init__(self, name):
+                self.name = name
+                self.event = Event(self)
+
+            def handle_event(self, *_):
+                out.write(self.name)
+                out.write('\n')
+
+        # Create objects for firing and handling events.
+        spam = Spam('spam')
+        eggs = Spam('eggs')
+        ham = Spam('ham')
+        bacon = Spam('bacon')
+
+        # Register event listeners.
+        spam.event.register_listener(eggs.handle_event, after=[bacon.handle_event])
+        spam.event.register_listener(ham.handle_event)
+        spam.event.register_listener(bacon.handle_event, priority=-1)
+        spam.event.register_listener(spam.handle_event, priority=1)
+
+        # Trigger an event.
+        spam.event.trigger()
+
+        # Start the event loop.
+        dispatcher.loop()
+
+        actual = out.getvalue()
+
+        expected = """
+spam
+ham
+bacon
+eggs
+"""
+
+        self.assertEqual(expected.strip(), actual.strip())
+
+        names = [[listener.listener_ref().name for listener in stage] for stage in
+                 spam.event.internal_get_dispatch_plan()]
+        self.assertEqual([['spam', 'ham', 'bacon'], ['eggs']], names)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_ordering_cyclic(self):
+        """
+        Test cyclic ordering constraints are rejected.
+        """
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event1(self, *_):
+                pass
+
+            def handle_event2(self, *_):
+                pass
+
+        # Create object for firing and handling events.
+        spam = Spam()
+
+        # Register event listeners.
+        spam.event.register_listener(spam.handle_event1, before=[spam.handle_event2])
+        with self.assertRaises(ValueError):
+            spam.event.register_listener(spam.handle_event2, before=[spam.handle_event1])
+
+        # The rejected listener must not have been registered.
+        self.assertEqual(1, len(spam.event.internal_get_listeners(None)))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_ordering_cyclic_unrelated(self):
+        """
+        Test a listener that is not on a cycle is accepted when a cycle has been completed by a listener without
+        ordering constraints.
+        """
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, *_):
+                pass
+
+        # Create objects for firing and handling events.
+        spam = Spam()
+        m = Spam()
+        x = Spam()
+        y = Spam()
+        z = Spam()
+        eggs = Spam()
+
+        # Register event listeners. Registering m completes the cycle m -> x -> y -> m.
+        spam.event.register_listener(y.handle_event, before=[m.handle_event])
+        spam.event.register_listener(x.handle_event, after=[m.handle_event], before=[y.handle_event])
+        spam.event.register_listener(m.handle_event)
+
+        # z is not on the cycle.
+        spam.event.register_listener(z.handle_event, after=[x.handle_event])
+
+        self.assertEqual(4, len(spam.event.internal_get_listeners(None)))
+
+        # A listener on the cycle is still rejected.
+        with self.assertRaises(ValueError):
+            spam.event.register_listener(z.handle_event, after=[y.handle_event], before=[x.handle_event])
+
+        # A listener that closes a cycle with a listener that must be notified after a method that was not registered
+        # yet is rejected.
+        spam.event.register_listener(spam.handle_event, after=[eggs.handle_event])
+        with self.assertRaises(ValueError):
+            spam.event.register_listener(eggs.handle_event, after=[spam.handle_event])
+
+        # Unregistered listeners are not part of any cycle.
+        spam.event.unregister_method(spam.handle_event)
+        spam.event.register_listener(eggs.handle_event, after=[spam.handle_event])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_ordering_chain(self):
+        """
+        Test registering listeners with ordering constraints does not build the dispatch plan.
+        """
+        out = StringIO()
+
+        dispatcher = EventDispatcher.instance()
+
+        class Spam:
+            def __init__(self, name):
+                self.name = name
+                self.event = Event(self)
+
+            def handle_event(self, *_):
+                out.write(self.name)
+                out.write('\n')
+
+        # Create objects for firing and handling events.
+        spam = Spam('spam')
+        eggs = [Spam(str(i)) for i in range(100)]
+
+        # Build the dispatch plan for an event without listeners.
+        plan = spam.event.internal_get_dispatch_plan()
+
+        # Register event listeners in reverse order of notification.
+        spam.event.register_listener(eggs[-1].handle_event)
+        for i in range(len(eggs) - 2, -1, -1):
+            spam.event.register_listener(eggs[i].handle_event, before=[eggs[i + 1].handle_event])
+
+        # The dispatch plan has not been rebuild.
+        self.assertIs(plan, spam.event._Event__plan)
+
+        # Trigger an event.
+        spam.event.trigger()
+
+        # Start the event loop.
+        dispatcher.loop()
+
+        self.assertEqual([str(i) for i in range(100)], out.getvalue().split())
+        self.assertEqual(100, len(spam.event.internal_get_dispatch_plan()))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_churn(self):
+        """
+        Test listeners can (un)register listeners and drop listeners while the event is being dispatched.
+        """
+        out = StringIO()
+
+        dispatcher = EventDispatcher.instance()
+
+        class Spam:
+            def __init__(self, name):
+                self.name = name
+                self.event = Event(self)
+
+            def handle_event(self, *_):
+                out.write(self.name)
+                out.write('\n')
+
+        class Eggs(Spam):
+            def handle_event(self, event, *_):
+                super().handle_event()
+                created.append(Spam('new ' + self.name))
+                event.register_listener(created[-1].handle_event)
+                event.unregister_object(ham)
+                owner.bacon = None
+                gc.collect()
+
+        # Create objects for firing and handling events.
+        created = []
+        owner = Spam('spam')
+        eggs = Eggs('eggs')
+        ham = Spam('ham')
+        owner.bacon = Spam('bacon')
+
+        # Register event listeners.
+        owner.event.register_listener(eggs.handle_event)
+        owner.event.register_listener(ham.handle_event)
+        owner.event.register_listener(owner.bacon.handle_event)
+
+        # Trigger some events before the event loop.
+        owner.event.trigger()
+        owner.event.trigger()
+
+        # Start the event loop.
+        dispatcher.loop()
+
+        actual = out.getvalue()
+
+        expected = """
+eggs
+eggs
+new eggs
+"""
+
+        self.assertEqual(expected.strip(), actual.strip())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_register_after_dispatch(self):
+        """
+        Test registering listeners after the event has been dispatched does not rebuild the dispatch plan.
+        """
+        dispatcher = EventDispatcher.instance()
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+                self.count = 0
+
+            def handle_event(self, *_):
+                self.count += 1
+
+        # Create objects for firing and handling events.
+        spam = Spam()
+        eggs = [Spam() for _ in range(100)]
+
+        # Dispatch the event once such that the dispatch plan has been build.
+        spam.event.register_listener(spam.handle_event)
+        spam.event.trigger()
+        dispatcher.loop()
+        plan = spam.event._Event__plan
+
+        # Register event listeners after the dispatch.
+        for egg in eggs:
+            spam.event.register_listener(egg.handle_event)
+
+        # The dispatch plan has not been rebuild.
+        self.assertIs(plan, spam.event._Event__plan)
+
+        # Trigger an event.
+        spam.event.trigger()
+
+        # Start the event loop.
+        dispatcher.exit = False
+        dispatcher.loop()
+
+        self.assertEqual(2, spam.count)
+        self.assertEqual(100, sum(egg.count for egg in eggs))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_deletion_after_unregister(self):
+        """
+        Test deleting objects that have been unregistered after the event has been dispatched has no side effects.
+        """
+        dispatcher = EventDispatcher.instance()
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, *_):
+                pass
+
+        # Create objects for firing and handling events.
+        spam = Spam()
+        eggs = Spam()
+        ham = Spam()
+
+        # Register event listeners.
+        spam.event.register_listener(eggs.handle_event)
+        spam.event.register_listener(ham.handle_event)
+
+        # Trigger an event and start the event loop.
+        spam.event.trigger()
+        dispatcher.loop()
+
+        # Unregister eggs, and unregister and register ham again.
+        spam.event.unregister_object(eggs)
+        spam.event.unregister_object(ham)
+        spam.event.register_listener(ham.handle_event)
+
+        # Exceptions in weak reference callbacks are written to stderr.
+        err = StringIO()
+        with redirect_stderr(err):
+            del eggs
+            del ham
+            gc.collect()
+
+        self.assertEqual('', err.getvalue())
+        self.assertEqual(0, len(spam.event.internal_get_listeners(None)))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_trigger_and_wait(self):
+        """
+        Test trigger_and_wait dispatches the event queue until the event has been handled.
+        """
+        out = StringIO()
+
+        dispatcher = EventDispatcher.instance()
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, event, event_data, *_):
+                out.write(event_data)
+                out.write('\n')
+
+                # Waiting from an event listener is not possible.
+                try:
+                    self.event.trigger_and_wait('nested')
+                except RuntimeError:
+                    pass
+
+        # Create object for firing events.
+        spam = Spam()
+
+        # Register event listener.
+        spam.event.register_listener(spam.handle_event)
+
+        # Trigger some events.
+        spam.event.trigger('event 1')
+        future = spam.event.trigger_and_wait('event 2')
+        spam.event.trigger('event 3')
+
+        self.assertTrue(future.done())
+
+        actual = out.getvalue()
+
+        expected = """
+event 1
+event 2
+"""
+
+        self.assertEqual(expected.strip(), actual.strip())
+
+        # Start the event loop.
+        dispatcher.loop()
+
+        actual = out.getvalue()
+
+        expected = """
+event 1
+event 2
+event 3
+"""
+
+        self.assertEqual(expected.strip(), actual.strip())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_atrigger(self):
+        """
+        Test atrigger can be awaited until the event has been handled and other coroutines run in the meantime.
+        """
+        out = StringIO()
+
+        EventDispatcher.instance()
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, event, event_data, *_):
+                out.write(event_data)
+                out.write('\n')
+
+                # Waiting from an event listener is not possible.
+                try:
+                    self.event.atrigger('nested').send(None)
+                except RuntimeError:
+                    out.write('refused')
+                    out.write('\n')
+
+        # Create object for firing events.
+        spam = Spam()
+
+        # Register event listener.
+        spam.event.register_listener(spam.handle_event)
+
+        async def produce():
+            future = await spam.event.atrigger('event 2')
+            out.write(str(future.done()))
+            out.write('\n')
+
+        async def tick():
+            for _ in range(3):
+                out.write('tick')
+                out.write('\n')
+                await asyncio.sleep(0)
+
+        # Trigger an event before the coroutines.
+        spam.event.trigger('event 1')
+
+        async def main():
+            await asyncio.gather(produce(), tick())
+
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(main())
+        loop.close()
+
+        actual = out.getvalue()
+
+        expected = """
+event 1
+refused
+tick
+event 2
+refused
+True
+tick
+tick
+"""
+
+        self.assertEqual(expected.strip(), actual.strip())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_trigger_with_future(self):
+        """
+        Test the future of a trigger can be awaited and its callbacks are called when the event has been handled.
+        """
+        out = StringIO()
+
+        dispatcher = EventDispatcher.instance()
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, event, event_data, *_):
+                out.write(event_data)
+                out.write('\n')
+
+        def callback(future):
+            out.write('callback ' + str(future.done()))
+            out.write('\n')
+            raise RuntimeError('Callback failed')
+
+        # Create object for firing events.
+        spam = Spam()
+
+        # Register event listener.
+        spam.event.register_listener(spam.handle_event)
+
+        async def wait():
+            future = spam.event.trigger_with_future('event 1')
+            future.add_done_callback(callback)
+            self.assertFalse(future.done())
+            await future
+            out.write('done')
+            out.write('\n')
+
+        async def produce():
+            await asyncio.sleep(0)
+            await spam.event.atrigger('event 2')
+
+        async def main():
+            await asyncio.gather(wait(), produce())
+
+        # Exceptions raised by callbacks are written to stderr.
+        err = StringIO()
+        with redirect_stderr(err):
+            loop = asyncio.new_event_loop()
+            loop.run_until_complete(main())
+            loop.close()
+
+        self.assertIn('Callback failed', err.getvalue())
+        self.assertFalse(dispatcher.is_running)
+
+        actual = out.getvalue()
+
+        expected = """
+event 1
+callback True
+done
+event 2
+"""
+
+        self.assertEqual(expected.strip(), actual.strip())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_watermarks(self):
+        """
+        Test events event_queue_high and event_queue_low.
+        """
+        out = StringIO()
+
+        dispatcher = EventDispatcher.instance()
+        dispatcher.high_watermark = 3
+        dispatcher.low_watermark = 1
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, event, event_data, listener_data):
+                out.write(listener_data + ' ' + str(event_data))
+                out.write('\n')
+
+        # Create object for firing events.
+        spam = Spam()
+
+        # Register event listeners.
+        dispatcher.event_queue_high.register_listener(spam.handle_event, 'high')
+        dispatcher.event_queue_low.register_listener(spam.handle_event, 'low')
+        spam.event.register_listener(spam.handle_event, 'spam')
+
+        # Trigger some events before the event loop.
+        for i in range(4):
+            spam.event.trigger(i)
+
+        # Start the event loop.
+        dispatcher.loop()
+
+        actual = out.getvalue()
+
+        expected = """
+high 3
+spam 0
+spam 1
+low 1
+spam 2
+spam 3
+"""
+
+        self.assertEqual(expected.strip(), actual.strip())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_watermarks_from_listener(self):
+        """
+        Test event event_queue_high does not interrupt the event listener that fills the event queue.
+        """
+        out = StringIO()
+
+        dispatcher = EventDispatcher.instance()
+        dispatcher.high_watermark = 2
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, event, event_data, listener_data):
+                out.write(listener_data + ' ' + str(event_data))
+                out.write('\n')
+
+            def fill_queue(self, *_):
+                out.write('start filling')
+                out.write('\n')
+                for i in range(3):
+                    self.event.trigger(i)
+                out.write('stop filling')
+                out.write('\n')
+
+        # Create object for firing events.
+        spam = Spam()
+
+        # Register event listeners.
+        dispatcher.event_loop_start.register_listener(spam.fill_queue)
+        dispatcher.event_queue_high.register_listener(spam.handle_event, 'high')
+        dispatcher.event_queue_low.register_listener(spam.handle_event, 'low')
+        spam.event.register_listener(spam.handle_event, 'spam')
+
+        # Start the event loop.
+        dispatcher.loop()
+
+        actual = out.getvalue()
+
+        expected = """
+start filling
+stop filling
+high 3
+spam 0
+spam 1
+low 0
+spam 2
+"""
+
+        self.assertEqual(expected.strip(), actual.strip())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_watermarks_invalid(self):
+        """
+        Test the low watermark must be less than the high watermark.
+        """
+        dispatcher = EventDispatcher.instance()
+        dispatcher.high_watermark = 10
+        dispatcher.low_watermark = 5
+
+        with self.assertRaises(ValueError):
+            dispatcher.low_watermark = 10
+
+        with self.assertRaises(ValueError):
+            dispatcher.high_watermark = 5
+
+        self.assertEqual(10, dispatcher.high_watermark)
+        self.assertEqual(5, dispatcher.low_watermark)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_register_listeners(self):
+        """
+        Test listeners can be registered in bulk.
+        """
+        out = StringIO()
+
+        dispatcher = EventDispatcher.instance()
+
+        class Spam:
+            def __init__(self, name):
+                self.name = name
+                self.event = Event(self)
+
+            def handle_event(self, event, event_data, listener_data):
+                out.write(event.emitter.name + ' ' + self.name + ' ' + listener_data)
+                out.write('\n')
+
+        # Create objects for firing and handling events.
+        spam1 = Spam('spam1')
+        spam2 = Spam('spam2')
+        eggs = Spam('eggs')
+        ham = Spam('ham')
+
+        # Register event listeners in bulk and one by one.
+        dispatcher.register_listeners([(spam1.event, eggs.handle_event, 'bulk 1'),
+                                       (spam2.event, eggs.handle_event, 'bulk 2'),
+                                       (spam1.event, ham.handle_event, 'bulk 3')])
+        spam1.event.register_listener(eggs.handle_event, 'single')
+        spam1.event.register_listeners([(ham.handle_event, 'bulk 4')])
+
+        # Listeners registered in bulk do not keep objects alive.
+        ham_ref = weakref.ref(ham)
+        err = StringIO()
+        with redirect_stderr(err):
+            del ham
+            gc.collect()
+        self.assertIsNone(ham_ref())
+        self.assertEqual('', err.getvalue())
+
+        # Trigger an event.
+        spam1.event.trigger()
+
+        # Start the event loop.
+        dispatcher.loop()
+
+        actual = out.getvalue()
+
+        expected = """
+spam1 eggs bulk 1
+spam1 eggs single
+"""
+
+        self.assertEqual(expected.strip(), actual.strip())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_register_listeners_garbage(self):
+        """
+        Test listeners registered in bulk of an event that is never triggered release their listener data when their
+        objects are garbage collected.
+        """
+        EventDispatcher.instance()
+
+        class Data:
+            pass
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, *_):
+                pass
+
+        # Create objects for firing and handling events.
+        spam = Spam()
+        eggs = [Spam() for _ in range(100)]
+        data = [Data() for _ in range(100)]
+        data_refs = [weakref.ref(item) for item in data]
+
+        # Register event listeners in bulk.
+        spam.event.register_listeners(zip([egg.handle_event for egg in eggs], data))
+
+        # Exceptions in weak reference callbacks are written to stderr.
+        err = StringIO()
+        with redirect_stderr(err):
+            del data
+            del eggs
+            gc.collect()
+
+        self.assertEqual('', err.getvalue())
+        self.assertEqual([], [item for item in data_refs if item() is not None])
+        self.assertEqual(0, len(spam.event.internal_get_listeners(None)))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_register_listeners_deferred(self):
+        """
+        Test listeners registered in bulk are set up when the event is dispatched for the first time.
+        """
+        EventDispatcher.instance()
+
+        class Spam:
+            def __init__(self):
+                self.event = Event(self)
+
+            def handle_event(self, *_):
+                pass
+
+        # Create objects for firing and handling events.
+        spam = Spam()
+        eggs = [Spam() for _ in range(100)]
+
+        # Register event listeners in bulk.
+        spam.event.register_listeners([(egg.handle_event, None) for egg in eggs])
+
+        # No listeners have been set up yet.
+        self.assertEqual({}, spam.event._Event__listeners)
+
+        # Trigger an event and wait.
+        spam.event.trigger_and_wait()
+
+        self.assertEqual(100, len(spam.event._Event__listeners))
+        self.assertEqual(100, len(spam.event.internal_get_listeners(None)))
+
 # ----------------------------------------------------------------------------------------------------------------------